@@ -17,6 +17,20 @@ from typing import List, Tuple, Optional
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to plain NumPy
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    import cupy
+except ImportError:  # CuPy is optional; only needed for device="gpu"
+    cupy = None
+
 
 @dataclass
 class ModelConfig:
@@ -25,6 +39,8 @@ class ModelConfig:
     epochs: int = 1000
     batch_size: int = 32
     regularization: float = 0.001
+    device: str = "cpu"  # "cpu" or "gpu" (CuPy)
+    verbose: bool = False
 
 
 class BaseModel(ABC):
@@ -59,7 +75,7 @@ class BaseModel(ABC):
 
 
 class LinearRegression(BaseModel):
-    """Implementation of Linear Regression with gradient descent."""
+    """Implementation of ridge Linear Regression via the normal equations."""
     
     def __init__(self, config: ModelConfig):
         super().__init__(config)
@@ -68,149 +84,323 @@ class LinearRegression(BaseModel):
     
     def fit(self, X: np.ndarray, y: np.ndarray) -> None:
         """
-        Train linear regression model using gradient descent.
+        Train linear regression model by solving the ridge normal equations.
+        
+        Mathematical formulation (on centered X and y, bias unregularized):
+        θ = (X^T * X + m*λ*I)^-1 * X^T * y
         
-        Mathematical formulation:
-        θ = θ - α * (1/m) * X^T * (X*θ - y)
+        This is the exact minimizer of the regularized MSE that gradient
+        descent converges to, so no training epochs are needed.
         
         Args:
             X: Training features (m x n)
             y: Training targets (m x 1)
         """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        y = np.ascontiguousarray(y, dtype=np.float32)
         m, n = X.shape
-        self.weights = np.random.normal(0, 0.01, n)
-        self.bias = 0
         
-        for epoch in range(self.config.epochs):
-            # Forward pass
-            y_pred = X @ self.weights + self.bias
-            
-            # Compute loss (MSE with L2 regularization)
-            loss = np.mean((y - y_pred) ** 2)
-            reg_loss = self.config.regularization * np.sum(self.weights ** 2)
-            total_loss = loss + reg_loss
-            
-            # Backward pass
-            dw = (2/m) * X.T @ (y_pred - y) + 2 * self.config.regularization * self.weights
-            db = (2/m) * np.sum(y_pred - y)
-            
-            # Update parameters
-            self.weights -= self.config.learning_rate * dw
-            self.bias -= self.config.learning_rate * db
-            
-            # Store loss for monitoring
-            if epoch % 100 == 0:
-                self.loss_history.append(total_loss)
-                print(f"Epoch {epoch}: Loss = {total_loss:.6f}")
+        # Center the data so the bias drops out of the regularized system
+        X_mean = X.mean(axis=0)
+        y_mean = y.mean()
+        Xc = X - X_mean
+        yc = y - y_mean
+        
+        # Solve (X^T X + m*λ*I) w = X^T y
+        A = Xc.T @ Xc + m * self.config.regularization * np.eye(n, dtype=np.float32)
+        b = Xc.T @ yc
+        self.weights = np.linalg.solve(A, b)
+        self.bias = y_mean - X_mean @ self.weights
+        
+        # Record the final loss (MSE with L2 regularization) for monitoring,
+        # reducing in float64 so the sums don't drift
+        y_pred = X @ self.weights + self.bias
+        loss = np.mean((y - y_pred) ** 2, dtype=np.float64)
+        reg_loss = self.config.regularization * np.sum(self.weights ** 2, dtype=np.float64)
+        total_loss = loss + reg_loss
+        self.loss_history.append(float(total_loss))
+        if self.config.verbose:
+            print(f"Closed-form solution: Loss = {total_loss:.6f}")
         
         self.trained = True
     
     def predict(self, X: np.ndarray) -> np.ndarray:
-        """Make predictions using trained model."""
+        """
+        Make predictions using trained model.
+        
+        A single sample is promoted to a one-row batch; stack samples into
+        one matrix rather than calling this per row.
+        """
         if not self.trained:
             raise ValueError("Model must be trained before making predictions")
         
+        X = np.atleast_2d(np.ascontiguousarray(X, dtype=self.weights.dtype))
         return X @ self.weights + self.bias
 
 
+@njit(cache=True, fastmath=True)
+def _sigmoid_inplace(x: np.ndarray) -> None:
+    """
+    Overwrite x with sigmoid(x) without allocating temporaries.
+    
+    Uses sigmoid(x) = (1 + tanh(x / 2)) / 2, which saturates cleanly at both
+    extremes, so no clipping pass is needed to avoid overflow.
+    """
+    x *= 0.5
+    np.tanh(x, x)
+    x += 1
+    x *= 0.5
+
+
+@njit(cache=True, fastmath=True)
+def _forward(X: np.ndarray, weights: Tuple[np.ndarray, ...],
+             biases: Tuple[np.ndarray, ...]) -> np.ndarray:
+    """
+    Run the network forward over a batch and return the output activations.
+    
+    Numba compiles one specialization per parameter tuple type, i.e. per
+    layer count and dtype, so each architecture gets its own machine code.
+    """
+    current_input = X
+    for i in range(len(weights)):
+        z = current_input @ weights[i]
+        z += biases[i]
+        _sigmoid_inplace(z)
+        current_input = z
+    return current_input
+
+
+def _split_buffer(buffer: np.ndarray, shapes: List[Tuple[int, ...]]) -> List[np.ndarray]:
+    """Carve consecutive views with the given shapes out of a flat buffer."""
+    views = []
+    offset = 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        views.append(buffer[offset:offset + size].reshape(shape))
+        offset += size
+    return views
+
+
+@njit(cache=True, fastmath=True)
+def _train_epoch(X: np.ndarray, y: np.ndarray, order: np.ndarray, batch_size: int,
+                 params: np.ndarray, grads: np.ndarray,
+                 weights: Tuple[np.ndarray, ...], biases: Tuple[np.ndarray, ...],
+                 weight_grads: Tuple[np.ndarray, ...], bias_grads: Tuple[np.ndarray, ...],
+                 activations: Tuple[np.ndarray, ...], deltas: Tuple[np.ndarray, ...],
+                 learning_rate: float, compute_loss: bool) -> float:
+    """
+    Run one epoch of mini-batch SGD, updating parameters in place.
+    
+    Compiled with Numba when available so the whole forward/backward pass
+    runs without per-operation Python dispatch. Layer outputs and errors are
+    written into the preallocated activation and delta buffers, and all
+    layers are updated by a single step over the flat parameter buffer.
+    
+    Args:
+        X: Training features (m x n), C-contiguous
+        y: Training targets (m x k), C-contiguous
+        order: Sample permutation defining the mini-batches
+        batch_size: Number of samples per SGD step
+        params: Flat buffer backing every weight and bias
+        grads: Flat gradient buffer, same layout as params
+        weights: Per-layer weight matrices (views into params)
+        biases: Per-layer bias rows (1 x k) (views into params)
+        weight_grads: Per-layer weight gradients (views into grads)
+        bias_grads: Per-layer bias gradients (views into grads)
+        activations: Per-layer output buffers (batch_size x k)
+        deltas: Per-layer error buffers, same shapes as activations
+        learning_rate: SGD step size, same dtype as X
+        compute_loss: Whether to accumulate the epoch loss at all
+    
+    Returns:
+        Mean squared error over the epoch, each batch measured before its update
+        (left on the device when running on CuPy arrays), or 0 if not computed
+    """
+    m = X.shape[0]
+    n_layers = len(weights)
+    squared_error = 0.0
+    
+    for start in range(0, m, batch_size):
+        batch = order[start:start + batch_size]
+        X_batch = X[batch]
+        y_batch = y[batch]
+        rows = X_batch.shape[0]
+        step = learning_rate / X.dtype.type(rows)
+        
+        # Forward propagation
+        current_input = X_batch
+        for i in range(n_layers):
+            z = activations[i][:rows]
+            np.dot(current_input, weights[i], z)
+            z += biases[i]
+            # Sigmoid written out rather than calling _sigmoid_inplace, so the
+            # uncompiled kernel stays free of Numba calls on the GPU path
+            z *= 0.5
+            np.tanh(z, z)
+            z += 1
+            z *= 0.5
+            current_input = z
+        
+        # Output error, plus the loss when this epoch is being recorded
+        delta = deltas[n_layers - 1][:rows]
+        np.subtract(current_input, y_batch, delta)
+        if compute_loss:
+            squared_error += np.sum(delta ** 2, dtype=np.float64)
+        
+        # Backward propagation (sigmoid'(z) = a * (1 - a) from the cached output)
+        delta *= current_input * (1 - current_input)
+        
+        for i in range(n_layers - 1, -1, -1):
+            layer_input = X_batch if i == 0 else activations[i - 1][:rows]
+            
+            # Compute gradients (batch sums; averaged through step)
+            np.dot(layer_input.T, delta, weight_grads[i])
+            bias_grads[i][0] = delta.sum(axis=0)
+            
+            # Propagate error backwards
+            if i > 0:
+                prev_delta = deltas[i - 1][:rows]
+                np.dot(delta, weights[i].T, prev_delta)
+                delta = prev_delta
+                delta *= layer_input * (1 - layer_input)
+        
+        # Update every layer at once through the flat buffers
+        grads *= step
+        params -= grads
+    
+    return squared_error / y.size
+
+
 class NeuralNetwork(BaseModel):
     """Simple feedforward neural network implementation."""
     
     def __init__(self, config: ModelConfig, hidden_sizes: List[int]):
         super().__init__(config)
-        self.hidden_sizes = hidden_sizes
-        self.layers = []
+        # Architecture is fixed at construction so compiled kernels can specialize on it
+        self.hidden_sizes = tuple(hidden_sizes)
+        self.weights: List[np.ndarray] = []
+        self.biases: List[np.ndarray] = []
+        self._params: Optional[np.ndarray] = None
         
     def _initialize_weights(self, input_size: int, output_size: int):
         """Initialize weights using Xavier initialization."""
-        sizes = [input_size] + self.hidden_sizes + [output_size]
-        self.layers = []
+        sizes = [input_size, *self.hidden_sizes, output_size]
+        weight_shapes = list(zip(sizes[:-1], sizes[1:]))
+        bias_shapes = [(1, size) for size in sizes[1:]]
         
-        for i in range(len(sizes) - 1):
+        # All weights, then all biases, share one flat buffer
+        self._params = np.zeros(sum(int(np.prod(shape)) for shape in weight_shapes + bias_shapes),
+                                dtype=np.float32)
+        views = _split_buffer(self._params, weight_shapes + bias_shapes)
+        self.weights = views[:len(weight_shapes)]
+        self.biases = views[len(weight_shapes):]
+        
+        for weight in self.weights:
             # Xavier initialization
-            limit = np.sqrt(6 / (sizes[i] + sizes[i + 1]))
-            weight = np.random.uniform(-limit, limit, (sizes[i], sizes[i + 1]))
-            bias = np.zeros((1, sizes[i + 1]))
-            self.layers.append({'weight': weight, 'bias': bias})
-    
-    def _sigmoid(self, x: np.ndarray) -> np.ndarray:
-        """Sigmoid activation function."""
-        return 1 / (1 + np.exp(-np.clip(x, -500, 500)))  # Prevent overflow
-    
-    def _sigmoid_derivative(self, x: np.ndarray) -> np.ndarray:
-        """Derivative of sigmoid function."""
-        s = self._sigmoid(x)
-        return s * (1 - s)
+            limit = np.sqrt(6 / (weight.shape[0] + weight.shape[1]))
+            weight[...] = np.random.uniform(-limit, limit, weight.shape)
     
     def fit(self, X: np.ndarray, y: np.ndarray) -> None:
-        """Train neural network using backpropagation."""
+        """
+        Train neural network using mini-batch backpropagation.
+        
+        With config.device == "gpu" the data and parameters are copied to the
+        GPU once and the epoch kernel runs uncompiled on CuPy arrays, which the
+        NumPy calls inside it dispatch to; the trained parameters are copied
+        back to the host at the end.
+        """
         m, n = X.shape
         output_size = 1 if len(y.shape) == 1 else y.shape[1]
         
         self._initialize_weights(n, output_size)
         
+        xp = np
+        train_epoch = _train_epoch
+        if self.config.device == "gpu":
+            if cupy is None:
+                raise ValueError("GPU training requires CuPy to be installed")
+            xp = cupy
+            train_epoch = getattr(_train_epoch, "py_func", _train_epoch)
+        
+        X = xp.ascontiguousarray(xp.asarray(X), dtype=xp.float32)
+        y = xp.ascontiguousarray(xp.asarray(y).reshape(-1, output_size), dtype=xp.float32)
+        
+        # Parameter arrays are updated in place by the compiled epoch kernel
+        shapes = [p.shape for p in self.weights + self.biases]
+        params = xp.asarray(self._params)
+        param_views = _split_buffer(params, shapes)
+        weights = tuple(param_views[:len(self.weights)])
+        biases = tuple(param_views[len(self.weights):])
+        
+        grads = xp.empty_like(params)
+        grad_views = _split_buffer(grads, shapes)
+        weight_grads = tuple(grad_views[:len(weights)])
+        bias_grads = tuple(grad_views[len(weights):])
+        
+        # Every `@` in the kernel must see C-contiguous operands to stay on the BLAS GEMM path
+        assert X.flags.c_contiguous and y.flags.c_contiguous
+        assert all(p.flags.c_contiguous for p in weights + biases + weight_grads + bias_grads)
+        
+        # Scratch buffers reused by every batch instead of per-layer temporaries
+        batch_size = min(self.config.batch_size, m)
+        activations = tuple(xp.empty((batch_size, b.shape[1]), dtype=xp.float32) for b in biases)
+        deltas = tuple(xp.empty_like(a) for a in activations)
+        
         for epoch in range(self.config.epochs):
-            # Forward propagation
-            activations = [X]
-            current_input = X
-            
-            for layer in self.layers:
-                z = current_input @ layer['weight'] + layer['bias']
-                current_input = self._sigmoid(z)
-                activations.append(current_input)
-            
-            # Compute loss
-            loss = np.mean((y.reshape(-1, 1) - activations[-1]) ** 2)
+            # Loss is only computed, and pulled back to the host, on recorded epochs
+            record = epoch % 100 == 0
+            order = xp.random.permutation(m)
+            loss = train_epoch(X, y, order, batch_size, params, grads,
+                               weights, biases, weight_grads, bias_grads,
+                               activations, deltas, np.float32(self.config.learning_rate),
+                               record)
             
-            # Backward propagation
-            delta = (activations[-1] - y.reshape(-1, 1)) * self._sigmoid_derivative(activations[-1])
-            
-            for i in range(len(self.layers) - 1, -1, -1):
-                # Compute gradients
-                dW = activations[i].T @ delta / m
-                db = np.mean(delta, axis=0, keepdims=True)
-                
-                # Update weights
-                self.layers[i]['weight'] -= self.config.learning_rate * dW
-                self.layers[i]['bias'] -= self.config.learning_rate * db
-                
-                # Propagate error backwards
-                if i > 0:
-                    delta = (delta @ self.layers[i]['weight'].T) * self._sigmoid_derivative(activations[i])
-            
-            if epoch % 100 == 0:
-                self.loss_history.append(loss)
-                print(f"Epoch {epoch}: Loss = {loss:.6f}")
+            if record:
+                self.loss_history.append(float(loss))
+                if self.config.verbose:
+                    print(f"Epoch {epoch}: Loss = {self.loss_history[-1]:.6f}")
+        
+        if xp is not np:
+            self._params[...] = params.get()
         
         self.trained = True
     
     def predict(self, X: np.ndarray) -> np.ndarray:
-        """Make predictions using trained neural network."""
+        """
+        Make predictions using trained neural network.
+        
+        Every layer runs as a matrix-matrix product over the whole batch, so
+        stack samples into one matrix rather than calling this per row; a
+        single sample is promoted to a one-row batch.
+        """
         if not self.trained:
             raise ValueError("Model must be trained before making predictions")
         
-        current_input = X
-        for layer in self.layers:
-            z = current_input @ layer['weight'] + layer['bias']
-            current_input = self._sigmoid(z)
-        
-        return current_input.flatten()
+        X = np.atleast_2d(np.ascontiguousarray(X, dtype=self.weights[0].dtype))
+        return _forward(X, tuple(self.weights), tuple(self.biases)).flatten()
 
 
-def generate_synthetic_data(n_samples: int = 1000, noise_level: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
+def generate_synthetic_data(n_samples: int = 1000, noise_level: float = 0.1,
+                            rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generate synthetic regression data for testing.
     
     Args:
         n_samples: Number of samples to generate
         noise_level: Amount of noise to add to the target
+        rng: Random generator to draw from (defaults to a fresh PCG64 generator)
     
     Returns:
         Tuple of (features, targets)
     """
-    X = np.random.randn(n_samples, 3)
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    X = rng.standard_normal((n_samples, 3))
     # True relationship: y = 2*x1 - 1.5*x2 + 0.8*x3 + noise
-    y = 2 * X[:, 0] - 1.5 * X[:, 1] + 0.8 * X[:, 2] + noise_level * np.random.randn(n_samples)
+    coef = np.array([2.0, -1.5, 0.8], dtype=X.dtype)
+    y = X @ coef
+    y += noise_level * rng.standard_normal(n_samples)
     
     return X, y
 
@@ -221,11 +411,13 @@ def main():
     print("=" * 50)
     
     # Generate synthetic data
-    X_train, y_train = generate_synthetic_data(800, noise_level=0.1)
-    X_test, y_test = generate_synthetic_data(200, noise_level=0.1)
+    rng = np.random.default_rng()
+    X_train, y_train = generate_synthetic_data(800, noise_level=0.1, rng=rng)
+    X_test, y_test = generate_synthetic_data(200, noise_level=0.1, rng=rng)
     
     # Configure models
-    config = ModelConfig(learning_rate=0.01, epochs=1000, regularization=0.001)
+    config = ModelConfig(learning_rate=0.01, epochs=200, batch_size=32, regularization=0.001,
+                         verbose=True)
     
     # Train Linear Regression
     print("\n📊 Training Linear Regression...")